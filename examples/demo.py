@@ -1,7 +1,12 @@
 import asyncio as aio
-from asyncio import run
 from math import sin
 
+# Run the demo on `uvloop` if it is installed, since its event loop schedules callbacks faster
+try:
+    from uvloop import run
+except ImportError:
+    from asyncio import run
+
 import terminology as tmg
 
 from shelltools.shell import *
@@ -44,8 +49,7 @@ class MockShell(Shell):
         """
         Print many alerts
         """
-        for i in range(100):
-            self.log("alert")
+        self.log_many("alert" for i in range(100))
 
     @command()
     async def do_timmed_alert(self):
@@ -134,13 +138,15 @@ class MockShell(Shell):
                 nonlocal keep_going
                 keep_going = False
 
+            handle_event = Match() & {
+                (True, Key.left): move_left,
+                (True, Key.right): move_right,
+                (False, Key.esc): stop,
+                tuple: lambda _: None,
+            }
+
             while keep_going:
-                Match(await listener.get()) & {
-                    (True, Key.left): move_left,
-                    (True, Key.right): move_right,
-                    (False, Key.esc): stop,
-                    tuple: lambda _: None,
-                }
+                handle_event(await listener.get())
                 await aio.sleep(10e-3)
 
 
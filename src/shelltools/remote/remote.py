@@ -1,18 +1,21 @@
 import asyncio as aio
-import multiprocessing as mp
-import multiprocessing.connection
-from typing import Any, Optional
+import io
+import os
+from collections import deque
+from contextlib import suppress
+from functools import partial
+from select import select
+from threading import Thread
+from typing import Any, Callable, Deque, Optional
 from warnings import warn
 
 import serial as sr
 from unpadded import Client, PacketStatus  # type: ignore
 
 from shelltools.annotation import DispatcherLike, KeyLike
-from shelltools.utility.match import Match
 
-IO_REFRESH_DELAY_S = 50e-3
-RESPONSE_CHECK_DELAY_S = 1e-3
 SERIAL_TIMEOUT_S = 500e-3
+RX_CHUNK_SIZE = 4096
 
 HEADER = b"\xff\xff\xff\xff"
 
@@ -24,77 +27,92 @@ class Remote(Client):
 
     def __init__(self, port: str, dispatcher: DispatcherLike, reply_key: KeyLike):
         """
-        Start listening to a serial port and hold a pipe to a tracker process
+        Start listening to a serial port from a worker thread
         """
 
-        self.__pipe, remote_pipe = mp.Pipe()
         self.__dispatcher = dispatcher
         self.__loop = aio.get_event_loop()
-        self.__active_request_uid, self.__next_request_uid = 0, 0
+        self.__pending_requests: Deque[aio.Future] = deque()
         self.__exception: Optional[Exception] = None
-        self.__process = mp.Process(
-            target=_RemoteProcess(
-                port=port, pipe=remote_pipe, dispatcher=dispatcher, reply_key=reply_key
-            ),
-            daemon=True,
+        self.__worker = _RemoteWorker(
+            port=port,
+            dispatcher=dispatcher,
+            reply_key=reply_key,
+            respond=partial(self.__loop.call_soon_threadsafe, self.__resolve),
         )
-        self.__process.start()
+        self.__thread = Thread(target=self.__worker, name="remote", daemon=True)
+        self.__thread.start()
 
-    def new_request(self, payload: bytes) -> aio.Task:
+    def new_request(self, payload: bytes) -> aio.Future:
         """
-        Have the process send a new request
+        Have the worker send a new request
 
-        Each request is given an UID which is used to keep track of the order of creation. The newest request are resolved first by the remote device.
+        The remote device resolves the requests in the order they have been created. The returned future is resolved with the response once it is received.
         """
-        self.__pipe.send(payload)
-        request_awaiter = self.__loop.create_task(
-            self.__get_response(self.__next_request_uid)
-        )
-        self.__next_request_uid += 1
-        return request_awaiter
+        request = self.__loop.create_future()
+        if self.__exception is not None:
+            request.set_exception(self.__exception)
+        else:
+            self.__worker.send(payload)
+            self.__pending_requests.append(request)
+        return request
 
-    async def __get_response(self, uid: int) -> Any:
+    def close(self) -> None:
         """
-        Wait asynchronously for the pending request with the given UID to be resolved
+        Stop the worker and wait for it to close the serial port
 
-        The responses are received in the same order as the requests, so the coroutine wait for the other requests with lesser UID to be resolved first.
-        If the process send an exception through the pipe, then every current and future pending request raise this exception when awaited.
+        Any request still pending, or made afterwards, raises a ``RuntimeError`` when awaited. The responses received before the worker stopped are still delivered. Closing a remote which is already closed has no effect.
         """
-        while not (
-            self.__active_request_uid == uid
-            and self.__pipe.poll()
-            or self.__exception is not None
-        ):
-            await aio.sleep(RESPONSE_CHECK_DELAY_S)
-        self.__active_request_uid += 1
+        if self.__thread.is_alive():
+            self.__worker.stop()
+            self.__thread.join()
 
-        if self.__exception is not None:
-            raise self.__exception
+        if self.__exception is None:
+            self.__exception = RuntimeError("The remote has been closed")
+            self.__loop.call_soon(self.__resolve, self.__exception)
+
+    def __resolve(self, result: Any) -> None:
+        """
+        Resolve the oldest pending request with the response sent back by the worker
 
-        result = self.__pipe.recv()
+        The responses are received in the same order as the requests. If the worker sends an exception, then every current and future pending request raise this exception when awaited.
+        """
         if isinstance(result, Exception):
             self.__exception = result
-            raise self.__exception
-        else:
-            return result
+            while self.__pending_requests:
+                request = self.__pending_requests.popleft()
+                if not request.done():
+                    request.set_exception(result)
+            return
 
+        request = self.__pending_requests.popleft()
+        if not request.done():
+            request.set_result(result)
 
-class _RemoteProcess:
+
+class _RemoteWorker:
     """
     Manages the communication to the remote device and resolve request from the remote device
+
+    The worker runs its own event loop in a dedicated thread. Requests are handed to that loop with ``send`` and the responses are handed back with the ``respond`` callback, so no data is copied between them.
     """
 
     def __init__(
         self,
         port: str,
-        pipe: mp.connection.Connection,
         dispatcher: DispatcherLike,
         reply_key: KeyLike,
+        respond: Callable[[Any], Any],
     ):
         """
         Open the serial port to the device
+
+        The port is put in low latency mode when the platform and the driver support it. When the port has a file descriptor, it is read and written directly with ``os.read`` and ``os.write``, bypassing the buffering logic of pyserial. ``respond`` must be safe to call from the worker thread.
         """
-        self.__pipe = pipe
+        self.__loop = aio.new_event_loop()
+        self.__stopped = self.__loop.create_future()
+        self.__requests: aio.Queue[bytes] = aio.Queue()
+        self.__respond = respond
         self.__dispatcher = dispatcher
         self.__serial = sr.Serial(
             port=port,
@@ -105,61 +123,113 @@ class _RemoteProcess:
             timeout=SERIAL_TIMEOUT_S,
         )
 
-        self.__dispatcher.replace(
-            reply_key, lambda reply: aio.create_task(self.__reply_callback(reply))
-        )
+        # Drivers such as FTDI's coalesce the received bytes for up to 16 ms unless the port is in low latency mode
+        if hasattr(self.__serial, "set_low_latency_mode"):
+            try:
+                self.__serial.set_low_latency_mode(True)
+            except ValueError:
+                pass  # The port is not backed by a UART (e.g. a pseudo-terminal)
+
+        try:
+            fd = self.__serial.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            self.__stop_fd: Optional[int] = None
+            self.__stop_notifier_fd: Optional[int] = None
+            self.__read = lambda: self.__serial.read(self.__serial.in_waiting or 1)
+            self.__write = self.__serial.write
+        else:
+            self.__stop_fd, self.__stop_notifier_fd = os.pipe()
+            self.__read = partial(_read_fd, fd, self.__stop_fd)
+            self.__write = partial(_write_fd, fd)
+
+        self.__dispatcher.replace(reply_key, self.__reply_callback)
 
     def __call__(self) -> None:
         """
         Start the listening of the remote device
+
+        The serial port is closed once the worker stops. If the port is read directly from its file descriptor, the thread reading it is woken up beforehand.
+        """
+        aio.set_event_loop(self.__loop)
+        try:
+            self.__loop.run_until_complete(self.__start())
+        finally:
+            self.__loop.close()
+            if self.__stop_notifier_fd is not None:
+                os.close(self.__stop_notifier_fd)
+            self.__serial.close()
+
+    def send(self, payload: bytes) -> None:
+        """
+        Queue a request to be sent to the remote device
+
+        This method can be called from any thread.
+        """
+        self.__loop.call_soon_threadsafe(self.__requests.put_nowait, payload)
+
+    def stop(self) -> None:
+        """
+        Have the worker stop, without reporting any error through ``respond``
+
+        This method can be called from any thread.
+        """
+        with suppress(RuntimeError):  # The worker loop is already closed
+            self.__loop.call_soon_threadsafe(self.__resolve_stopped)
+
+    def __resolve_stopped(self) -> None:
+        """
+        Notify ``__start`` that the worker has been stopped
         """
-        aio.run(self.__start())
+        if not self.__stopped.done():
+            self.__stopped.set_result(None)
 
     async def __start(self) -> None:
         """
-        Receive request from the remote device and handle command from the control pipe
+        Receive request from the remote device and handle the queued requests
 
-        This coroutine start two other coroutines (``__handle_tx`` and ``__handle_rx``) which can only finish when an exception is raised by either or both of them. When it happens, those exceptions are sent to main process through the pipe and any coroutine that did not throw is cancelled, then the ``__start`` coroutine finishes.
+        This coroutine start two other coroutines (``__handle_tx`` and ``__handle_rx``) which can only finish when an exception is raised by either or both of them. When it happens, those exceptions are sent back through the ``respond`` callback and any coroutine that did not throw is cancelled, then the ``__start`` coroutine finishes. Both coroutines are cancelled as well when ``stop`` is called.
         """
-        self.__response_received_condition = aio.Condition()
-        loop = aio.get_event_loop()
-        handle_tx, handle_rx = loop.create_task(self.__handle_tx()), loop.create_task(
-            self.__handle_rx()
-        )
+        self.__response_received_event = aio.Event()
+        handle_tx = self.__loop.create_task(self.__handle_tx())
+        handle_rx = self.__loop.create_task(self.__handle_rx())
         done, pending = await aio.wait(
-            [handle_tx, handle_rx], return_when=aio.FIRST_EXCEPTION
+            [handle_tx, handle_rx, self.__stopped], return_when=aio.FIRST_COMPLETED
         )
         for coro in done:
-            self.__pipe.send(coro.exception())
+            if coro is not self.__stopped:
+                self.__respond(coro.exception())
         for coro in pending:
             coro.cancel()
 
     async def __handle_tx(self) -> None:
         """
-        Transmit the packets received from the main process want to send to the remote device
+        Transmit the queued requests to the remote device
 
         It is assumed that the remote device can handle only one request at a time. Once a request is sent, the coroutine await for ``__reply_callback`` to be invoked (which occurs when the response has been received).
+
+        The packets are assembled in a single buffer starting with the header, which is reused from one request to the next.
         """
+        packet = bytearray(HEADER)
         while True:
-            if self.__pipe.poll():
-                self.__serial.write(HEADER + self.__pipe.recv())
-                async with self.__response_received_condition:
-                    await self.__response_received_condition.wait()
-
-            await aio.sleep(IO_REFRESH_DELAY_S)
+            payload = await self.__requests.get()
+            del packet[len(HEADER) :]
+            packet += payload
+            self.__response_received_event.clear()
+            self.__write(packet)
+            await self.__response_received_event.wait()
 
     async def __handle_rx(self) -> None:
         """
-        Receive the packets from the remote device and send them to the main process
+        Receive the packets from the remote device and forward them to the dispatcher
 
-        It forwards the packet to the underlying dispatcher, but does not send back any response.
+        No response is sent back to the remote device. Between two packets, the header is searched for in the received chunks with ``bytes.find``, so the bytes preceding it are not iterated over in Python.
         """
 
         header_sentinel = len(HEADER)
 
         def raise_corrupted_packet():
             raise RuntimeError(
-                "A corrupted packet has been received. Process will stop."
+                "A corrupted packet has been received. Worker will stop."
             )
 
         def check_unloaded_dispatcher():
@@ -172,28 +242,112 @@ class _RemoteProcess:
                 )
                 self.__dispatcher.write_to(lambda x: None)
 
+        on_packet_status = {
+            PacketStatus.DROPPED_PACKET: raise_corrupted_packet,
+            PacketStatus.RESOLVED_PACKET: check_unloaded_dispatcher,
+            PacketStatus.LOADING_PACKET: None,
+        }
+        put = self.__dispatcher.put
+
+        received: aio.Queue[bytes | Exception] = aio.Queue()
+        Thread(
+            target=self.__read_serial, args=(received,), name="remote-rx", daemon=True
+        ).start()
+
         while True:
-            while self.__serial.in_waiting > 0:
-                x = self.__serial.read(1)
-                if header_sentinel == 0:
-                    Match(self.__dispatcher.put(int.from_bytes(x, "little"))) & {
-                        PacketStatus.DROPPED_PACKET: raise_corrupted_packet,
-                        PacketStatus.RESOLVED_PACKET: check_unloaded_dispatcher,
-                        PacketStatus.LOADING_PACKET: lambda: None,
-                    }
-                else:
-                    header_sentinel = (
-                        header_sentinel - 1 if x == HEADER[:1] else len(HEADER)
-                    )
-
-            await aio.sleep(IO_REFRESH_DELAY_S)
-
-    async def __reply_callback(self, reply: bytes) -> None:
+            data = await received.get()
+            if isinstance(data, Exception):
+                raise data
+
+            i = 0
+            while i < len(data):
+                if header_sentinel != 0:
+                    i, header_sentinel = _skip_header(data, i, header_sentinel)
+                    continue
+
+                for i in range(i, len(data)):
+                    action = on_packet_status[put(data[i])]
+                    if action is not None:
+                        action()
+                        if header_sentinel != 0:
+                            break
+                i += 1
+
+    def __read_serial(self, received: aio.Queue) -> None:
+        """
+        Read the serial port and hand the received bytes over to the worker loop
+
+        This method blocks and is meant to run in a dedicated thread, so the worker loop is only woken up when bytes are actually received. It stops once the serial port cannot be read anymore, the error being handed over to the worker loop as well.
+        """
+        try:
+            while True:
+                data = self.__read()
+                if data:
+                    self.__loop.call_soon_threadsafe(received.put_nowait, data)
+        except Exception as e:
+            with suppress(RuntimeError):  # The worker loop is already closed
+                self.__loop.call_soon_threadsafe(received.put_nowait, e)
+        finally:
+            if self.__stop_fd is not None:
+                os.close(self.__stop_fd)
+
+    def __reply_callback(self, reply: bytes) -> None:
         """
         Callback invoked when received the remote device response
 
         When called, `__handle_tx` is notified of the availability of the remote device.
         """
-        self.__pipe.send(bytes(reply))
-        async with self.__response_received_condition:
-            self.__response_received_condition.notify_all()
+        self.__respond(bytes(reply))
+        self.__response_received_event.set()
+
+
+def _skip_header(data: bytes, start: int, header_sentinel: int) -> tuple[int, int]:
+    """
+    Look for the end of the next header in ``data`` from ``start``
+
+    ``header_sentinel`` is the number of header bytes still expected, some of them having possibly been received at the end of the previous chunk. Return the index of the first byte following the header and 0 if the header is complete, or the length of ``data`` and the number of header bytes still expected otherwise.
+    """
+    if header_sentinel != len(HEADER):
+        expected = HEADER[len(HEADER) - header_sentinel :]
+        received = data[start : start + header_sentinel]
+        if expected.startswith(received):
+            if len(received) == header_sentinel:
+                return start + header_sentinel, 0
+            return len(data), header_sentinel - len(received)
+
+    i = data.find(HEADER, start)
+    if i != -1:
+        return i + len(HEADER), 0
+
+    tail = data[max(start, len(data) - len(HEADER) + 1) :]
+    return len(data), len(HEADER) - len(tail) + len(tail.rstrip(HEADER[:1]))
+
+
+def _read_fd(fd: int, stop_fd: int) -> bytes:
+    """
+    Block until bytes are received from ``fd`` and return them
+
+    Unlike ``Serial.read``, the read never times out. Since the port is configured by pyserial for reads to return immediately, an empty read right after ``fd`` became readable means the device has been disconnected. The wait is also interrupted when ``stop_fd`` becomes readable, which happens once the other end of its pipe is closed.
+    """
+    readable, _, _ = select([fd, stop_fd], [], [])
+    if stop_fd in readable:
+        raise sr.SerialException("The serial port has been closed")
+    try:
+        data = os.read(fd, RX_CHUNK_SIZE)
+    except BlockingIOError:
+        return b""
+    if not data:
+        raise sr.SerialException("The remote device has been disconnected")
+    return data
+
+
+def _write_fd(fd: int, data: bytes) -> None:
+    """
+    Write the whole of ``data`` to ``fd``, waiting for room in the output buffer when it is full
+    """
+    view = memoryview(data)
+    while view:
+        try:
+            view = view[os.write(fd, view) :]
+        except BlockingIOError:
+            select([], [fd], [])
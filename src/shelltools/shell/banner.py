@@ -1,8 +1,36 @@
-import os
+from functools import lru_cache
 from typing import Callable
 
 import terminology as tmg
 
+from ..utility.terminal import terminal_columns
+
+_PARTIAL_BLOCKS = tuple(chr(ord("█") + 7 - remainder) for remainder in range(8))
+
+
+@lru_cache(maxsize=256)
+def _full_blocks(n: int) -> str:
+    """
+    Get a run of ``n`` full blocks
+
+    Consecutive frames of a bar mostly share the same number of full blocks, so the strings are reused instead of being built again.
+    """
+    return n * "█"
+
+
+@lru_cache
+def _spinner_frames(pattern: str) -> tuple[str, ...]:
+    """
+    Get every frame of the animation of a spinner drawn with ``pattern``
+
+    The frames are only built once per pattern and shared by the spinners.
+    """
+    n = len(pattern)
+    return tuple(
+        pattern[(i + 4) % n] + pattern[i] + pattern[(i + 6) % n] + pattern[(i + 2) % n]
+        for i in range(n)
+    )
+
 
 class ProgressBar:
     """
@@ -10,6 +38,16 @@ class ProgressBar:
     ``| Hi ! |██████████████████████████████████████████``
     """
 
+    __slots__ = (
+        "__prefix",
+        "__styled_prefix",
+        "__modifier",
+        "__bg_modifier_when_full",
+        "__progress",
+        "__columns",
+        "__bar_width",
+    )
+
     def __init__(
         self,
         text: str = "",
@@ -19,34 +57,34 @@ class ProgressBar:
         """
         Set the text to display before the bar
 
-        A modifier can be specified to change the color of the bar.
+        A modifier can be specified to change the color of the bar. The text does not change, so it is styled once and for all.
         """
-        self.__text = text
+        self.__prefix = f"| {text} |"
+        self.__styled_prefix = modifier(self.__prefix)
         self.__modifier = modifier
         self.__bg_modifier_when_full = bg_modifier_when_full
         self.__progress = 0.0
+        self.__columns = 0
+        self.__bar_width = 0
 
     def __str__(self) -> str:
         """
         Get the string representation of the bar
         """
-        prefix = f"| {self.__text} |"
+        self.__fit_terminal()
 
         if self.__progress > 1:
             overflow_text = "OVERFLOW >>"
-            return self.__modifier(prefix) + self.__bg_modifier_when_full(
-                (os.get_terminal_size().columns - len(prefix + overflow_text)) * " "
-                + overflow_text
+            return self.__styled_prefix + self.__bg_modifier_when_full(
+                overflow_text.rjust(self.__bar_width)
             )
         if self.__progress < 0:
-            return self.__modifier(prefix + " << UNDERFLOW")
+            return self.__styled_prefix + self.__modifier(" << UNDERFLOW")
 
-        blocks_nb = int(
-            8 * (os.get_terminal_size().columns - len(prefix)) * self.__progress
+        blocks_nb = int((self.__bar_width << 3) * self.__progress)
+        return self.__styled_prefix + self.__modifier(
+            _full_blocks(blocks_nb >> 3) + _PARTIAL_BLOCKS[blocks_nb & 7]
         )
-        remainder = blocks_nb % 8
-        last_chr = chr(ord("█") + 7 - remainder)
-        return self.__modifier(prefix + int(blocks_nb / 8) * "█" + last_chr)
 
     @property
     def progress(self) -> float:
@@ -59,6 +97,15 @@ class ProgressBar:
     def progress(self, p: float) -> None:
         self.__progress = p
 
+    def __fit_terminal(self) -> None:
+        """
+        Compute the room left for the bar if the terminal has been resized since the last rendering
+        """
+        columns = terminal_columns()
+        if columns != self.__columns:
+            self.__columns = columns
+            self.__bar_width = columns - len(self.__prefix)
+
 
 class TwoWayBar:
     """
@@ -71,13 +118,27 @@ class TwoWayBar:
     ``| Hello... |__________________________________________________________████████████████████████████████████████``
     """
 
+    __slots__ = (
+        "__prefix",
+        "__styled_prefix",
+        "__modifier",
+        "__bg_modifier",
+        "__progress",
+    )
+
     def __init__(
         self,
         text: str = "",
         modifier: Callable[[str], str] = lambda x: x,
         bg_modifier: Callable[[str], str] = lambda x: tmg.on_white(tmg.in_black(x)),
     ):
-        self.__text = text
+        """
+        Set the text to display before the bar
+
+        The text does not change, so it is styled once and for all.
+        """
+        self.__prefix = f"| {text} |"
+        self.__styled_prefix = modifier(self.__prefix)
         self.__modifier = modifier
         self.__bg_modifier = bg_modifier
         self.__progress = 0.0
@@ -86,37 +147,33 @@ class TwoWayBar:
         """
         Get the string representation of the bar
         """
-        prefix = f"| {self.__text} |"
-        screen_width = os.get_terminal_size().columns
-        origin = int((screen_width - len(prefix)) / 2)
+        screen_width = terminal_columns()
+        origin = int((screen_width - len(self.__prefix)) / 2)
 
         if self.__progress > 1:
             text_overflow = "OVEFLOW >>"
             return (
-                self.__modifier(prefix)
+                self.__styled_prefix
                 + " " * origin
-                + self.__bg_modifier(
-                    " " * (origin - len(text_overflow)) + text_overflow
-                )
+                + self.__bg_modifier(text_overflow.rjust(origin))
             )
         if self.__progress < -1:
             text_overflow = " << OVEFLOW"
-            return self.__modifier(prefix) + self.__bg_modifier(
-                text_overflow + " " * (origin - len(text_overflow))
+            return self.__styled_prefix + self.__bg_modifier(
+                text_overflow.ljust(origin)
             )
 
         blocks_nb = int(origin * self.__progress)
-        remainder = blocks_nb % 8
-        last_chr = chr(ord("█") + 7 - remainder)
+        last_chr = _PARTIAL_BLOCKS[blocks_nb & 7]
         if blocks_nb > 0:
             return (
-                self.__modifier(prefix)
+                self.__styled_prefix
                 + " " * origin
-                + self.__modifier("█" * blocks_nb + last_chr)
+                + self.__modifier(_full_blocks(blocks_nb) + last_chr)
             )
         else:
-            return self.__modifier(prefix) + self.__bg_modifier(
-                "█" * (origin + blocks_nb) + last_chr + " " * -(blocks_nb + 1)
+            return self.__styled_prefix + self.__bg_modifier(
+                _full_blocks(origin + blocks_nb) + last_chr + " " * -(blocks_nb + 1)
             )
 
     @property
@@ -138,26 +195,30 @@ class BarSpinner:
     ``| Spinning... |▅▃▁▇``
     """
 
+    __slots__ = (
+        "__prefix",
+        "__modifier",
+        "__progress",
+        "__frames",
+    )
+
     PATTERN = "▁▂▃▄▅▆▇█"
 
     def __init__(self, text: str = "", modifier: Callable[[str], str] = lambda x: x):
-        self.__text = text
+        """
+        Set the text to display before the spinner and get every frame of the animation
+        """
+        self.__prefix = f"| {text} |"
         self.__modifier = modifier
         self.__progress = 0
+        self.__frames = _spinner_frames(self.PATTERN)
 
     def __str__(self) -> str:
         """
         Update the progress and return the new representation
         """
-        self.__progress = (self.__progress + 1) % len(self.PATTERN)
-
-        line = f"| {self.__text} |" + (
-            self.PATTERN[(self.__progress + 4) % len(self.PATTERN)]
-            + self.PATTERN[self.__progress]
-            + self.PATTERN[(self.__progress + 6) % len(self.PATTERN)]
-            + self.PATTERN[(self.__progress + 2) % len(self.PATTERN)]
-        )
+        self.__progress = (self.__progress + 1) % len(self.__frames)
 
         return self.__modifier(
-            line + (os.get_terminal_size().columns - len(line)) * " "
+            (self.__prefix + self.__frames[self.__progress]).ljust(terminal_columns())
         )
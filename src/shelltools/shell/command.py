@@ -1,23 +1,32 @@
 import asyncio as aio
 import os
-import threading
-from argparse import ArgumentParser, Namespace
-from textwrap import dedent
+from argparse import SUPPRESS, ArgumentParser, Namespace, _StoreAction
+from concurrent.futures import Future
+from functools import partial, wraps
+from inspect import cleandoc
 from typing import Any, Callable, Coroutine, Dict, NoReturn, Optional, Union
 
 import terminology as tmg
 
+from ..utility.terminal import terminal_columns
 from .keyboard_listener import KeyboardListener
-from .shell import Shell, ShellType
+from .shell import Shell, ShellType, _noop
 
 KNOWN_COMPATIBLE_TERMINALS = ["xterm"]
 
+_FAST_TYPES: Dict[Any, Callable[[str], Any]] = {
+    None: str,
+    str: str,
+    int: int,
+    float: float,
+}
+
 
 def command(capture_keyboard: Optional[str] = None) -> Callable:
     """
     Make a command compatible with the underlying ``cmd.Cmd`` class
 
-    It should only be used on methods of a class derived from ``Shell`` whose identifiers begin with ``do_``.
+    It should only be used on methods of a class derived from ``Shell`` whose identifiers begin with ``do_``. The command keeps the name and the docstring of the method, so they are available to ``help``.
 
     The command can choose to capture keyboard input with the parameter ``capture_keyboard``. Its value should be the name of the command parameter which will receive the keyboard listener.
     """
@@ -27,7 +36,11 @@ def command(capture_keyboard: Optional[str] = None) -> Callable:
 
         wrapper = _ensure_wrapper(f)
 
-        return lambda obj, line: startup(obj, line, wrapper)
+        @wraps(wrapper.function)
+        def dispatch(obj, line):
+            return startup(obj, line, wrapper)
+
+        return dispatch
 
     def startup(obj, line, wrapper):
         nonlocal capture_keyboard
@@ -51,7 +64,7 @@ def command(capture_keyboard: Optional[str] = None) -> Callable:
                 )
 
             is_blocking = True
-            extra_parameters[capture_keyboard] = KeyboardListener()
+            extra_parameters[capture_keyboard] = KeyboardListener(obj.loop)
             extra_parameters[capture_keyboard].start()
 
         wrapper.call_command(obj, line, extra_parameters, cleanup, is_blocking)
@@ -81,21 +94,36 @@ def argument(*args, **kwargs) -> Callable[[Callable], Callable]:
 
 
 class _Wrapper:
+    __slots__ = ("__f", "__parser", "is_async")
+
     def __init__(self, f: Callable):
         """
         Hold a callable which will received the CLI arguments
+
+        ``is_async`` tells whether the callable is an async function. It is computed once here since it cannot change.
         """
         self.__f = f
+        self.__parser: Optional[_Parser] = None
+        self.is_async = aio.iscoroutinefunction(f)
 
-        doc = tmg.in_bold(dedent(f.__doc__)) if f.__doc__ else None
-        self.parser = _Parser(prog=f.__name__, description=doc)
+    @property
+    def parser(self) -> "_Parser":
+        """
+        The parser of the CLI arguments
+
+        It is only built when first needed, that is when an argument is specified or when the command is first called.
+        """
+        if self.__parser is None:
+            doc = cleandoc(self.__f.__doc__) if self.__f.__doc__ else None
+            self.__parser = _Parser(prog=self.__f.__name__, description=doc)
+        return self.__parser
 
     @property
-    def is_async(self) -> bool:
+    def function(self) -> Callable:
         """
-        Tell whether the stored callable is an async function
+        The stored callable
         """
-        return aio.iscoroutinefunction(self.__f)
+        return self.__f
 
     def call_command(
         self,
@@ -111,9 +139,11 @@ class _Wrapper:
         The async function will also be given the ``extra_parameters`` keyword parameters.
         If ``is_blocking`` is ``True``, the thread reading the standard input will block until the command is done.
 
-        When the command is done, ``cleanup`` will be called.
+        When the command is done, ``cleanup`` will be called. Since it only has to release the extra parameters, it is skipped when there are none.
         """
-        cleanup_callback = lambda: cleanup(extra_parameters)
+        cleanup_callback = (
+            partial(cleanup, extra_parameters) if extra_parameters else _noop
+        )
 
         try:
             if self.is_async:
@@ -121,11 +151,11 @@ class _Wrapper:
                     shell, **vars(self.parser.parse(shell, line)), **extra_parameters
                 )
                 if is_blocking:
-                    done_event = threading.Event()
+                    done: Future[None] = Future()
                     shell.create_task(
-                        _run_then_notify(coro, done_event), cleanup_callback
+                        coro, partial(_cleanup_then_notify, cleanup_callback, done)
                     )
-                    done_event.wait()
+                    done.result()
                 else:
                     shell.create_task(coro, cleanup_callback)
             else:
@@ -139,7 +169,7 @@ class _Wrapper:
         except SystemExit:
             pass
         finally:
-            if not self.is_async:
+            if not self.is_async and cleanup_callback is not _noop:
                 cleanup_callback()
 
         return True
@@ -150,19 +180,169 @@ class _Parser(ArgumentParser):
         """
         Initialize the underlying parser
         """
+        self.__is_fast_path_ready = False
+        self.__is_description_styled = False
+        self.__formatted: Dict[str, str] = {}
+        self.__formatted_key = (0, 0)
         super().__init__(
             *args,
             **kwargs,
         )
 
+    def add_argument(self, *args, **kwargs):
+        """
+        Add an argument specification and invalidate the fast path and the formatted strings
+        """
+        self.__is_fast_path_ready = False
+        self.__formatted.clear()
+        return super().add_argument(*args, **kwargs)
+
+    def add_argument_group(self, *args, **kwargs):
+        """
+        Add an argument group and invalidate the fast path and the formatted strings
+
+        The arguments of the group are not added with ``add_argument``, so the fast path is turned off for good by ``__prepare_fast_path`` as long as the parser has groups.
+        """
+        self.__is_fast_path_ready = False
+        self.__formatted.clear()
+        return super().add_argument_group(*args, **kwargs)
+
+    def add_mutually_exclusive_group(self, **kwargs):
+        """
+        Add a mutually exclusive group and invalidate the fast path and the formatted strings
+
+        The fast path cannot check the constraints of the group, so it is turned off by ``__prepare_fast_path`` as long as the parser has such groups.
+        """
+        self.__is_fast_path_ready = False
+        self.__formatted.clear()
+        return super().add_mutually_exclusive_group(**kwargs)
+
+    def set_defaults(self, **kwargs) -> None:
+        """
+        Set the parser-level defaults and invalidate the fast path and the formatted strings
+        """
+        self.__is_fast_path_ready = False
+        self.__formatted.clear()
+        super().set_defaults(**kwargs)
+
     def parse(self, shell: Shell, line: str) -> Namespace:
         """
         Parse the argument from a command line
 
         Instead of exiting the program, this method will raise a ``ShellError()`` if the parsing fails.
+
+        When the positional arguments of the command are plain, a line holding exactly one plain token per positional argument (and thus no option) is converted without going through ``argparse``. If the command takes no positional argument, a blank line is not even split. Any other line is left to ``parse_args``, so the error messages stay the same.
         """
         self.__shell = shell
-        return self.parse_args(line.split())
+
+        if not self.__is_fast_path_ready:
+            self.__prepare_fast_path()
+
+        if self.__positionals == () and (not line or line.isspace()):
+            return Namespace(**self.__defaults)
+
+        tokens = line.split()
+        if self.__positionals is not None and len(tokens) == len(self.__positionals):
+            try:
+                arguments = dict(self.__defaults)
+                for (dest, convert), token in zip(self.__positionals, tokens):
+                    if token[0] in self.prefix_chars:
+                        raise ValueError(token)
+                    arguments[dest] = convert(token)
+                return Namespace(**arguments)
+            except ValueError:
+                pass
+
+        return self.parse_args(tokens)
+
+    def __prepare_fast_path(self) -> None:
+        """
+        Collect what the fast path of ``parse`` needs to bypass ``argparse``
+
+        The fast path applies when every positional argument is single and stored as is or converted to ``int`` or ``float``, and no option is required. Options may be of any kind, their defaults are computed once the way ``parse_args`` would when they are absent from the line. The parser must not have any argument group beside the default ones nor any mutually exclusive group, since their arguments and constraints are out of reach of the fast path. When the fast path does not apply, ``__positionals`` is set to ``None``.
+        """
+        self.__is_fast_path_ready = True
+        self.__positionals: Optional[tuple] = None
+        self.__defaults: Dict[str, Any] = {}
+
+        if self._mutually_exclusive_groups or any(
+            group is not self._positionals and group is not self._optionals
+            for group in self._action_groups
+        ):
+            return
+
+        positionals = []
+        for action in self._actions:
+            if action.dest is not SUPPRESS and action.default is not SUPPRESS:
+                self.__defaults.setdefault(action.dest, action.default)
+
+            if action.option_strings:
+                if action.required:
+                    return
+            elif (
+                type(action) is not _StoreAction
+                or action.nargs is not None
+                or action.choices is not None
+                or action.type not in _FAST_TYPES
+            ):
+                return
+            else:
+                positionals.append((action.dest, _FAST_TYPES[action.type]))
+
+        self.__defaults.update(self._defaults)
+
+        for action in self._actions:
+            if (
+                action.option_strings
+                and isinstance(action.default, str)
+                and self.__defaults.get(action.dest) is action.default
+            ):
+                if action.type not in _FAST_TYPES:
+                    return
+                try:
+                    self.__defaults[action.dest] = _FAST_TYPES[action.type](
+                        action.default
+                    )
+                except ValueError:
+                    return
+
+        self.__positionals = tuple(positionals)
+
+    def format_usage(self) -> str:
+        """
+        Format the usage string once for the current terminal width
+        """
+        return self.__format("usage", super().format_usage)
+
+    def format_help(self) -> str:
+        """
+        Format the help string once for the current terminal width
+
+        The description is put in bold the first time the help is formatted, so commands whose help is never requested do not pay for it.
+        """
+        if not self.__is_description_styled:
+            self.__is_description_styled = True
+            if self.description:
+                self.description = tmg.in_bold(self.description)
+
+        return self.__format("help", super().format_help)
+
+    def __format(self, kind: str, format: Callable[[], str]) -> str:
+        """
+        Get a formatted string from the cache, or format it with ``format`` and cache it
+
+        The formatting depends on the width of the terminal, so the cache is cleared when this width changes. It is also cleared when the number of arguments changes, since the arguments added to a group do not go through ``add_argument``.
+        """
+        key = (terminal_columns(), len(self._actions))
+        if key != self.__formatted_key:
+            self.__formatted.clear()
+            self.__formatted_key = key
+
+        try:
+            return self.__formatted[kind]
+        except KeyError:
+            text = self.__formatted[kind] = format()
+            return text
 
     def print_usage(self, _=None) -> None:
         """
@@ -193,14 +373,16 @@ class _Parser(ArgumentParser):
         self.__shell.log(message)
 
 
-async def _run_then_notify(coro: Coroutine, done_event: threading.Event):
+def _cleanup_then_notify(cleanup: Callable[[], None], done: Future) -> None:
     """
-    Await ``coro`` then notify the caller that ``coro`` is done through ``done_event``
+    Call ``cleanup`` then notify the caller that the command is done through ``done``
 
-    This function is used to wait the completion of a coroutine from another thread.
+    This function is used as the cleanup callback of a task to wait for its completion from another thread. The caller is notified whether the task returned, raised or has been cancelled.
     """
-    await coro
-    done_event.set()
+    try:
+        cleanup()
+    finally:
+        done.set_result(None)
 
 
 def _ensure_wrapper(f: Union[Callable[..., Coroutine], _Wrapper]) -> _Wrapper:
@@ -1,6 +1,7 @@
 import asyncio as aio
-import threading
-from queue import Queue
+from collections import deque
+from time import monotonic
+from typing import Deque
 
 # Try importing `pynput` if possible, but do not interrupt the program if the import fail
 try:
@@ -13,18 +14,24 @@ KEYBOARD_LISTENER_REFRESH_DELAY_S = 10e-3
 
 
 class KeyboardListener:
-    def __init__(self):
+    def __init__(self, loop: aio.AbstractEventLoop):
+        """
+        Prepare a listener whose events are awaited from ``loop``
+        """
+        self.__loop = loop
         self.__pynput_listener = pynput.keyboard.Listener(
             on_press=self.__push_pressed, on_release=self.__push_released, suppress=True
         )
-        self.__event_lock = threading.Lock()
+        self.__last_event_s = float("-inf")
 
     def start(self):
         """
         Start listening to the keyboard
         """
 
-        self.__event_queue = Queue()
+        self.__events: Deque[tuple] = deque()
+        self.__event_received = aio.Event()
+        self.__is_wakeup_scheduled = False
         self.__pynput_listener.start()
         self.__pynput_listener.wait()
 
@@ -42,10 +49,10 @@ class KeyboardListener:
         The return value has the format ``(is_pressed, key)`` with ``is_pressed`` equaling ``True`` if the event is a key press (otherwise, it is a key release) and ``key`` the ``pynput.keyboard.Key`` object associated with the pressed / released key.
         """
 
-        while True:
-            if not self.__event_queue.empty():
-                return self.__event_queue.get_nowait()
-            await aio.sleep(0)
+        while not self.__events:
+            await self.__event_received.wait()
+            self.__event_received.clear()
+        return self.__events.popleft()
 
     def __push_pressed(self, key):
         """
@@ -54,11 +61,7 @@ class KeyboardListener:
         This method is meant to be invoked from ``__pynput_listener``.
         """
 
-        if self.__event_lock.locked():
-            return
-        self.__event_lock.acquire()
-        self.__event_queue.put((True, key))
-        self.__release_lock_later()
+        self.__push((True, key))
 
     def __push_released(self, key):
         """
@@ -67,19 +70,30 @@ class KeyboardListener:
         This method is meant to be invoked from ``__pynput_listener``.
         """
 
-        if self.__event_lock.locked():
+        self.__push((False, key))
+
+    def __push(self, event):
+        """
+        Hand an event over to the loop awaiting the events
+
+        Events arriving less than ``KEYBOARD_LISTENER_REFRESH_DELAY_S`` seconds after the last accepted one are dropped in order to slow down the arrival rate of the keyboard events. The event is appended to the deque right away, which is safe since there is a single producer and a single consumer, and a pending ``get`` is woken up from the loop thread. Events pushed while the wakeup is pending are delivered by the same wakeup.
+        """
+
+        now = monotonic()
+        if now - self.__last_event_s < KEYBOARD_LISTENER_REFRESH_DELAY_S:
             return
-        self.__event_lock.acquire()
-        self.__event_queue.put((False, key))
-        self.__release_lock_later()
+        self.__last_event_s = now
+        self.__events.append(event)
+        if not self.__is_wakeup_scheduled:
+            self.__is_wakeup_scheduled = True
+            self.__loop.call_soon_threadsafe(self.__wake_up)
 
-    def __release_lock_later(self):
+    def __wake_up(self):
         """
-        Release the lock on the event callbacks after ``KEYBOARD_LISTENER_REFRESH_DELAY_S`` seconds
+        Notify ``get`` that events have been pushed
 
-        This method is used within the event callbacks in order to slow down the arrival rate of the keyboard events.
+        This method is meant to be invoked from the loop.
         """
 
-        threading.Timer(
-            KEYBOARD_LISTENER_REFRESH_DELAY_S, self.__event_lock.release
-        ).start()
+        self.__is_wakeup_scheduled = False
+        self.__event_received.set()
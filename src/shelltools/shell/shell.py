@@ -1,18 +1,45 @@
 import asyncio as aio
 import cmd
 import threading
+from collections import deque
 from contextlib import asynccontextmanager
-from functools import partial
+from functools import lru_cache, partial
 from sys import stdin, stdout
-from typing import Callable, Coroutine, List, Optional, TextIO, TypeVar
+from typing import Callable, Coroutine, Deque, Iterable, Optional, Set, TextIO, TypeVar
 
 import terminology as tmg
 
+from ..utility.style import prestyled
 from ..utility.synchronized_ostream import SynchronizedOStream
+from ..utility.terminal import install_sigwinch_handler
 
 DEFAULT_PROMPT = "[shell] > "
 
 
+def _noop() -> None:
+    """
+    Stand for a missing cleanup callback
+
+    The callers check for it, so it is not even called.
+    """
+
+
+@lru_cache(maxsize=None)
+def _class_names(cls: type) -> tuple[str, ...]:
+    """
+    Get the attribute names of ``cls``, as listed by ``dir``
+
+    The commands are defined in the class bodies, so the names are only listed once per class.
+    """
+    return tuple(dir(cls))
+
+
+_in_red = prestyled(tmg.in_red)
+_in_green = prestyled(tmg.in_green)
+_in_yellow = prestyled(tmg.in_yellow)
+_in_bold_yellow = prestyled(lambda x: tmg.in_yellow(tmg.in_bold(x)))
+
+
 class Shell(cmd.Cmd):
     def __init__(
         self,
@@ -29,10 +56,17 @@ class Shell(cmd.Cmd):
         self.__use_rawinput = istream.isatty() and ostream.isatty()
         self.__istream = istream
         self.__ostream = SynchronizedOStream(
-            ostream, use_rawinput=self.__use_rawinput, modifier=tmg.in_yellow
+            ostream, use_rawinput=self.__use_rawinput, modifier=_in_yellow
         )
+        self.__log = self.__ostream.log
+        self.__log_many = self.__ostream.log_many
         self.__prompt = prompt
-        self.__running_tasks: List[aio.Task] = []
+        self.__running_tasks: Set[aio.Task] = set()
+        self.__pending_commands: Deque[
+            tuple[Coroutine, Callable[[], None], Optional[threading.Event]]
+        ] = deque()
+        self.__is_drain_scheduled = False
+        self.__finalize_task_without_cleanup = partial(self.__finalize_task, _noop)
         self.__continue = False
 
         super().__init__(stdin=istream, stdout=self.__ostream)
@@ -55,12 +89,23 @@ class Shell(cmd.Cmd):
         """
         Exit the shell if needed
 
-        It overrides the base class method of the same name. It allows to leave the shell whatever the input line might be.
+        It overrides the base class method of the same name. It allows to leave the shell whatever the input line might be. The unknown command name is only put in bold when the output is a terminal.
         """
         if not self.__continue:
             return True
 
-        self.log_error("`" + tmg.in_bold(line.split()[0]) + "` is not a command")
+        name = line.split(maxsplit=1)[0]
+        if self.__use_rawinput:
+            name = tmg.in_bold(name)
+        self.log_error("`" + name + "` is not a command")
+
+    def get_names(self):
+        """
+        Get the attribute names of the shell class
+
+        It overrides the base class method, which ``help`` and the completion use to find the commands. The names are listed once per class instead of on every call.
+        """
+        return list(_class_names(type(self)))
 
     def do_EOF(self, _) -> bool:
         """
@@ -75,9 +120,18 @@ class Shell(cmd.Cmd):
         """
         Start a shell session asynchronously
 
-        When the user decides to exit the shell, every running task will be cancelled, and the shell will wait for them to terminate.
+        When the user decides to exit the shell, every running task will be cancelled, and the shell will wait for them to terminate without polling them. The terminal resizes are watched from there, if the shell runs on the main thread.
         """
+        install_sigwinch_handler()
         self.__loop = aio.get_event_loop()
+        self.__loop_thread_id = threading.get_ident()
+        self.__loop_call_soon = self.__loop.call_soon
+        self.__loop_call_soon_threadsafe = self.__loop.call_soon_threadsafe
+        self.__loop_create_task = (
+            partial(aio.Task, loop=self.__loop, eager_start=True)
+            if hasattr(aio, "eager_task_factory")
+            else self.__loop.create_task
+        )
         self.__continue = True
         await self.__to_thread(self.cmdloop)
 
@@ -86,8 +140,8 @@ class Shell(cmd.Cmd):
         for task in self.__running_tasks:
             task.cancel()
 
-        while self.__running_tasks != []:
-            await aio.sleep(0)
+        while self.__running_tasks:
+            await aio.wait(list(self.__running_tasks))
 
     @property
     def is_running(self) -> bool:
@@ -96,20 +150,37 @@ class Shell(cmd.Cmd):
         """
         return self.__continue
 
+    @property
+    def loop(self) -> aio.AbstractEventLoop:
+        """
+        The event loop the shell session is running on
+        """
+        return self.__loop
+
     def call_soon(
         self,
         f: Callable,
         *args,
-        cleanup_callback: Callable[[], None] = lambda: None,
+        cleanup_callback: Callable[[], None] = _noop,
         **kwargs,
     ) -> None:
-        async def impl(f, *args, **kwargs):
-            f(*args, **kwargs)
+        """
+        Schedule a function to be called from the event loop
 
-        self.create_task(impl(f, *args, **kwargs), cleanup_callback)
+        Like ``create_task``, this method is thread-safe and waits for the function to be called, then the cleanup callback is invoked. The call is not wrapped in a task: the function is called right away by a loop callback, which also handles its exceptions.
+        """
+        event = threading.Event()
+        callback = partial(
+            self.__call, partial(f, *args, **kwargs), cleanup_callback, event
+        )
+        if threading.get_ident() == self.__loop_thread_id:
+            self.__loop_call_soon(callback)
+        else:
+            self.__loop_call_soon_threadsafe(callback)
+            event.wait()
 
     def create_task(
-        self, coro: Coroutine, cleanup_callback: Callable[[], None] = lambda: None
+        self, coro: Coroutine, cleanup_callback: Callable[[], None] = _noop
     ) -> None:
         """
         Schedule a coroutine to be carried out
@@ -119,11 +190,21 @@ class Shell(cmd.Cmd):
         A cleanup callback can be provided, which will be invoked when the task is done.
 
         This method make sure the provided coroutine is given the chance to run at least once before another command is processed. This way, the coroutine will not be cancelled by an EOF or any other command that terminates the shell without being given the chance to handle the cancellation.
+
+        When called from the thread of the event loop, the task creation is scheduled without waking the loop up through its self-pipe, and the method returns without waiting for the coroutine to start, since the loop could not start it in the meantime. No event is allocated in that case.
         """
+        if threading.get_ident() == self.__loop_thread_id:
+            self.__pending_commands.append((coro, cleanup_callback, None))
+            if not self.__is_drain_scheduled:
+                self.__is_drain_scheduled = True
+                self.__loop_call_soon(self.__create_pending_tasks)
+            return
+
         task_running_event = threading.Event()
-        self.__loop.call_soon_threadsafe(
-            self.__create_task, coro, cleanup_callback, task_running_event
-        )
+        self.__pending_commands.append((coro, cleanup_callback, task_running_event))
+        if not self.__is_drain_scheduled:
+            self.__is_drain_scheduled = True
+            self.__loop_call_soon_threadsafe(self.__create_pending_tasks)
         task_running_event.wait()
 
     def log(self, *args, **kwargs) -> None:
@@ -132,27 +213,33 @@ class Shell(cmd.Cmd):
 
         ``args`` and ``kwargs`` are forwarded to ``SynchronizedOStream.log``.
         """
-        self.__ostream.log(*args, **kwargs)
+        self.__log(*args, **kwargs)
+
+    def log_many(self, msgs: Iterable[str], *args, **kwargs) -> None:
+        """
+        Log several messages of any choosen style at once
+
+        The output stream is acquired once for all the messages. ``args`` and ``kwargs`` are forwarded to ``SynchronizedOStream.log_many``.
+        """
+        self.__log_many(msgs, *args, **kwargs)
 
     def log_error(self, msg: str, *args, **kwargs) -> None:
         """
         Log an error
         """
-        self.__ostream.log(msg, tmg.in_red, *args, **kwargs)
+        self.__log(msg, _in_red, *args, **kwargs)
 
     def log_help(self, msg: str, *args, **kwargs) -> None:
         """
         Log a help message
         """
-        self.__ostream.log(msg, tmg.in_green, *args, **kwargs)
+        self.__log(msg, _in_green, *args, **kwargs)
 
     def log_status(self, msg: str, *args, **kwargs) -> None:
         """
         Log a status message
         """
-        self.__ostream.log(
-            msg, lambda x: tmg.in_yellow(tmg.in_bold(x)), *args, **kwargs
-        )
+        self.__log(msg, _in_bold_yellow, *args, **kwargs)
 
     @asynccontextmanager
     async def banner(self, banner: str, refresh_delay_s: int):
@@ -176,60 +263,113 @@ class Shell(cmd.Cmd):
 
     async def __to_thread(self, callback: Callable[[], None]):
         """
-        Reimplement the behavior of ``asyncio.to_thread`` (which is not available for <3.9)
+        Run ``callback`` in a dedicated thread and wait for it to return
+
+        The thread resolves a future when it is done, so the loop is not kept busy polling it in the meantime.
         """
 
-        thread = threading.Thread(target=callback)
-        thread.start()
+        loop = aio.get_running_loop()
+        done = loop.create_future()
 
-        while thread.is_alive():
-            await aio.sleep(0)
+        def target():
+            try:
+                callback()
+            finally:
+                loop.call_soon_threadsafe(done.set_result, None)
 
-        thread.join()
+        threading.Thread(target=target, name="shell-cmdloop", daemon=True).start()
+        await done
+
+    def __create_pending_tasks(self) -> None:
+        """
+        Create a task for each coroutine queued by ``create_task``
+
+        Coroutines queued while this callback is pending are handled by the same call, so a burst of commands wakes the loop up only once.
+        """
+        self.__is_drain_scheduled = False
+        while self.__pending_commands:
+            self.__create_task(*self.__pending_commands.popleft())
 
     def __create_task(
         self,
         coro: Coroutine,
         cleanup_callback: Callable[[], None],
-        event: threading.Event,
+        event: Optional[threading.Event],
     ):
         """
         Schedule a coroutine to be carried out
 
-        This method is not thread-safe and should only be called through ``create_task``.
-        """
+        This method is not thread-safe and should only be called through ``__create_pending_tasks``.
 
-        async def impl(coro, event):
-            event.set()
-            await coro
+        Unless it is ``None``, ``event`` is set by a callback scheduled right after the first step of the task, so the caller is released once the coroutine has started. Where ``asyncio`` supports it (Python 3.12 and later), the first step is run eagerly by this method, so a command which completes without suspending is not scheduled at all.
+        """
 
-        task = self.__loop.create_task(impl(coro, event))
+        task = self.__loop_create_task(coro)
+        if event is not None:
+            self.__loop_call_soon(event.set)
         task.add_done_callback(
-            partial(self.__finalize_task, cleanup_callback=cleanup_callback)
+            self.__finalize_task_without_cleanup
+            if cleanup_callback is _noop
+            else partial(self.__finalize_task, cleanup_callback)
         )
-        self.__running_tasks.append(task)
+        self.__running_tasks.add(task)
 
-    def __finalize_task(
-        self, task: aio.Task, cleanup_callback: Callable[[], None] = lambda: None
-    ):
+    def __call(
+        self,
+        f: Callable[[], None],
+        cleanup_callback: Callable[[], None],
+        event: threading.Event,
+    ) -> None:
+        """
+        Call a function scheduled by ``call_soon`` then its cleanup callback
+
+        This method is not thread-safe and should only be called from the event loop. The exceptions are handled like those of the tasks, and ``event`` is set once the cleanup callback has returned.
+        """
+        try:
+            try:
+                f()
+            except Exception as e:
+                self.__handle_error(e)
+
+            if cleanup_callback is not _noop:
+                try:
+                    cleanup_callback()
+                except Exception as e:
+                    self.__handle_error(e)
+        finally:
+            event.set()
+
+    def __finalize_task(self, cleanup_callback: Callable[[], None], task: aio.Task):
         """
         Handle a command finalization and call the cleaning callback
 
         When a task associated to a command is done, this function is invoked to handle potential exception.
         """
-        try:
-            cleanup_callback()
-            self.__running_tasks.remove(task)
+        self.__running_tasks.remove(task)
 
-            if task.cancelled():
+        if cleanup_callback is not _noop:
+            try:
+                cleanup_callback()
+            except Exception as e:
+                self.__handle_error(e)
                 return
 
-            e = task.exception()
-            if e is not None:
-                raise e
-        except ShellError as e:
+        if task.cancelled():
+            return
+
+        e = task.exception()
+        if e is not None:
+            self.__handle_error(e)
+
+    def __handle_error(self, e: BaseException) -> None:
+        """
+        Report an exception raised by a command
+
+        A ``ShellError`` is only logged, whereas any other exception stops the shell.
+        """
+        if isinstance(e, ShellError):
             self.log_error(str(e))
-        except Exception as e:
+        else:
             self.__continue = False
             self.log_error(f"An unrecoverable error has occured : {e}")
             self.log_status("Press ENTER to quit.")
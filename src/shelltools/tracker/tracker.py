@@ -1,14 +1,17 @@
 import asyncio as aio
-import multiprocessing as mp
+from collections import deque
 from enum import IntEnum
-from typing import List
+from typing import TYPE_CHECKING, Deque, Tuple
 
-from pandas import DataFrame
+import numpy as np
 from unpadded import Client  # type: ignore
 
 from shelltools.annotation import KeyLike
 
-WRITE_MEASURE_REFRESH_DELAY_S = 1e-3
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+MEASURES_INITIAL_CAPACITY = 1024
 
 
 class Command(IntEnum):
@@ -20,113 +23,206 @@ class Command(IntEnum):
     STOP = 1
 
 
+# Plain integer values of the commands, which are sent without going through the enumeration
+CMD_START: int = Command.START.value
+CMD_STOP: int = Command.STOP.value
+
+
 class Tracker:
     def __init__(self, client: Client, control_key: KeyLike, report_key: KeyLike):
         """
         Initialize the report callback in ``client``
+
+        The measures are handed over to the tracking loop through a deque, so they are neither pickled nor sent through a pipe, and the loop is only woken up once per burst of reports. The tracking is considered stopped until the context is first entered, so the reports received before are dropped instead of being handed over to a loop which is not known yet.
         """
 
         self.__client = client
         self.__control_key = control_key
         self.__report_key = report_key
-        self.__queue: mp.Queue = mp.Queue()
+        self.__queue: Deque[Tuple[int, int, int]] = deque()
+        self.__measure_received_event = aio.Event()
+        self.__measure_written_event = aio.Event()
+        self.__is_wakeup_scheduled = False
         self.__stop_tracking_event = aio.Event()
-        self.__timestamps: List[int] = []
-        self.__left_measures: List[int] = []
-        self.__right_measures: List[int] = []
+        self.__stop_tracking_event.set()
+        self.__clear_measures()
 
         client.replace(report_key, self.__append_to_queue)
 
     @property
-    def timestamps(self) -> List[int]:
+    def timestamps(self) -> np.ndarray:
         """
         Get the reported timestamps so far
         """
-        return self.__timestamps
+        return self.__timestamps[: self.__measures_nb]
 
     @property
-    def left_measures(self) -> List[int]:
+    def left_measures(self) -> np.ndarray:
         """
         Get the reported left measures so far
         """
-        return self.__left_measures
+        return self.__left_measures[: self.__measures_nb]
 
     @property
-    def right_measures(self) -> List[int]:
+    def right_measures(self) -> np.ndarray:
         """
         Get the reported right measures so far
         """
-        return self.__right_measures
+        return self.__right_measures[: self.__measures_nb]
 
     @property
-    def data_frame(self) -> DataFrame:
+    def data_frame(self) -> "DataFrame":
         """
         Make a ``DataFrame`` out of all measures reported so far
+
+        The measures are sorted by timestamp with a single permutation of the arrays, so the ``DataFrame`` is built already sorted. The timestamps usually arrive in order, which is checked as they are written, in which case the arrays are not permuted at all.
+
+        ``pandas`` is only imported here, so the tracker can be used without paying for its import until a ``DataFrame`` is requested.
         """
+        from pandas import DataFrame
+
+        timestamps = self.timestamps
+        if self.__are_timestamps_sorted:
+            return DataFrame(
+                {
+                    "timestamp": timestamps,
+                    "left": self.left_measures,
+                    "right": self.right_measures,
+                }
+            )
 
-        df = DataFrame(
+        order = np.argsort(timestamps, kind="stable")
+        return DataFrame(
             {
-                "timestamp": self.__timestamps,
-                "left": self.__left_measures,
-                "right": self.__right_measures,
+                "timestamp": timestamps[order],
+                "left": self.left_measures[order],
+                "right": self.right_measures[order],
             }
         )
-        return df.sort_values("timestamp").reset_index(drop=True)
 
     async def __aenter__(self) -> "_TrackerContextManager":
         """
         Tell the remote device to start reporting
         """
 
-        self.__timestamps = []
-        self.__left_measures = []
-        self.__right_measures = []
+        self.__clear_measures()
         self.__stop_tracking_event.clear()
+        self.__queue.clear()
+        self.__measure_received_event.clear()
+        self.__is_wakeup_scheduled = False
+        self.__loop = aio.get_running_loop()
         self.__write_measure_task = aio.Task(self.__write_measure())
-        await self.__client.call(self.__control_key, Command.START)
-        return _TrackerContextManager(self)
+        await self.__client.call(self.__control_key, CMD_START)
+        return _TrackerContextManager(self, self.__measure_written_event)
 
     async def __aexit__(self, *_):
         """
         Tell the remote device to stop reporting
         """
 
-        await self.__client.call(self.__control_key, Command.STOP)
+        await self.__client.call(self.__control_key, CMD_STOP)
         self.__stop_tracking_event.set()
+        self.__loop.call_soon(self.__measure_received_event.set)
         await self.__write_measure_task
 
-    def __append_to_queue(self, timestamp: int, left: int, right: int) -> DataFrame:
+    def __append_to_queue(self, timestamp: int, left: int, right: int) -> None:
         """
-        Forward a measure to the main process
+        Forward a measure to the tracking loop
+
+        The report callback may be invoked from another thread, such as the worker of a ``Remote``. The measure is appended to the deque right away, which is safe since there is a single producer and a single consumer, and ``__write_measure`` is woken up from the tracking loop. Measures reported while the wakeup is pending are written by the same wakeup.
         """
         if not self.__stop_tracking_event.is_set():
-            self.__queue.put_nowait((timestamp, left, right))
+            self.__queue.append((timestamp, left, right))
+            if not self.__is_wakeup_scheduled:
+                self.__is_wakeup_scheduled = True
+                self.__loop.call_soon_threadsafe(self.__wake_up)
+
+    def __wake_up(self) -> None:
+        """
+        Notify ``__write_measure`` that measures have been reported
+
+        This method is meant to be invoked from the tracking loop.
+        """
+        self.__is_wakeup_scheduled = False
+        self.__measure_received_event.set()
 
     async def __write_measure(self) -> None:
         """
-        Append any measure received from the dispatcher process
+        Append any measure received from the dispatcher
+
+        The deque is waited for instead of being polled. Every measure received since the last wakeup is written at once into the arrays. Once ``__aexit__`` has stopped the tracking, the measures already handed over are written and this coroutine returns.
         """
 
-        while not self.__stop_tracking_event.is_set():
-            while not self.__queue.empty():
-                timestamp, left, right = self.__queue.get()
-                self.__timestamps.append(timestamp)
-                self.__left_measures.append(left)
-                self.__right_measures.append(right)
-            await aio.sleep(WRITE_MEASURE_REFRESH_DELAY_S)
+        while True:
+            await self.__measure_received_event.wait()
+            self.__measure_received_event.clear()
+
+            batch = []
+            while self.__queue:
+                batch.append(self.__queue.popleft())
+            if batch:
+                self.__write_batch(np.array(batch, dtype=np.int64))
+
+            if self.__stop_tracking_event.is_set():
+                return
+
+    def __write_batch(self, batch: np.ndarray) -> None:
+        """
+        Write the rows of ``batch`` after the measures written so far
+
+        The arrays are grown geometrically when the batch does not fit. The new timestamps are compared to their predecessors to tell whether they are still sorted. Once written, ``timeout`` is notified of the new measures.
+        """
+        begin = self.__measures_nb
+        end = begin + len(batch)
+
+        if end > len(self.__timestamps):
+            capacity = len(self.__timestamps)
+            while capacity < end:
+                capacity *= 2
+            self.__timestamps = np.resize(self.__timestamps, capacity)
+            self.__left_measures = np.resize(self.__left_measures, capacity)
+            self.__right_measures = np.resize(self.__right_measures, capacity)
+
+        self.__timestamps[begin:end] = batch[:, 0]
+        self.__left_measures[begin:end] = batch[:, 1]
+        self.__right_measures[begin:end] = batch[:, 2]
+        self.__measures_nb = end
+
+        if self.__are_timestamps_sorted:
+            written = self.__timestamps[max(begin - 1, 0) : end]
+            self.__are_timestamps_sorted = bool((written[1:] >= written[:-1]).all())
+
+        self.__measure_written_event.set()
+
+    def __clear_measures(self) -> None:
+        """
+        Allocate empty arrays for the measures
+
+        Each kind of measure is stored in its own array, which is grown geometrically when full. Only the first ``__measures_nb`` elements are meaningful.
+        """
+        self.__timestamps = np.empty(MEASURES_INITIAL_CAPACITY, dtype=np.int64)
+        self.__left_measures = np.empty_like(self.__timestamps)
+        self.__right_measures = np.empty_like(self.__timestamps)
+        self.__measures_nb = 0
+        self.__are_timestamps_sorted = True
 
 
 class _TrackerContextManager:
-    def __init__(self, tracker: Tracker):
+    def __init__(self, tracker: Tracker, measure_written_event: aio.Event):
         self.__tracker = tracker
+        self.__measure_written_event = measure_written_event
 
-    async def timeout(self, delay: int) -> DataFrame:
+    async def timeout(self, delay: int) -> "DataFrame":
         """
         Wait until no data has been received for at least ``timeout`` seconds and return all data that have been received so far
+
+        The tracker notifies this method whenever measures are written, so it returns as soon as ``delay`` seconds elapse without any, instead of checking the number of measures every ``delay`` seconds.
         """
-        measures_nb = None
-        while measures_nb != len(self.__tracker.timestamps):
-            measures_nb = len(self.__tracker.timestamps)
-            await aio.sleep(delay)
+        while True:
+            self.__measure_written_event.clear()
+            try:
+                await aio.wait_for(self.__measure_written_event.wait(), timeout=delay)
+            except aio.TimeoutError:
+                break
 
         return self.__tracker.data_frame
@@ -15,8 +15,10 @@ class Match:
 
     When trying to match the value against a pattern, the following sequence will be applied :
       - First, an attempt will be made to match by value; in that case, the corresponding object will be called if possible on zero parameters
-      - If no match has been found, then an attempt will be made to match by type; in that case, if the corresponding object is callable on the value or no parameters, it will be called (the one parameter call will be choosen if the number of parameters of the functor is non-zero, regardless of whether there are default parameters or not)
+      - If no match has been found, then an attempt will be made to match by type, the type of the value being tried before its base classes in method resolution order; in that case, if the corresponding object is callable on the value or no parameters, it will be called (the one parameter call will be choosen if the number of parameters of the functor is non-zero, regardless of whether there are default parameters or not)
       - In both case, if the corresponding object is not callable, it will simply be returned
+
+    When the same patterns are matched repeatedly (in an event loop for example), the second syntax lets the patterns be built once and reused.
     """
 
     def __init__(self, value: Any = None):
@@ -34,29 +36,37 @@ class Match:
 
 
 def _match_pattern(patterns: Dict, value: Any) -> Any:
-    # 'value' might not be hashable so we catch any exception that would come from patterns.get()
-    object_by_value = None
+    get = patterns.get
+
+    # 'value' might not be hashable, in which case it can only be matched by type
     try:
-        object_by_value = patterns.get(value)
-    except:
-        pass
+        object_by_value = get(value)
+    except TypeError:
+        object_by_value = None
 
     if object_by_value is not None:
         return object_by_value() if callable(object_by_value) else object_by_value
 
-    object_by_type = patterns.get(type(value))
+    # The exact type is tried first, so the common case does not walk the MRO
+    value_type = type(value)
+    object_by_type = get(value_type)
+    if object_by_type is None:
+        for base in value_type.__mro__[1:]:
+            object_by_type = get(base)
+            if object_by_type is not None:
+                break
     if object_by_type is not None:
         return object_by_type(value) if callable(object_by_type) else object_by_type
 
     try:
-        repr(value)
-    except:
-        pass
+        value_repr = repr(value)
+    except Exception:
+        value_repr = "<unrepresentable value>"
 
     raise RuntimeError(
         "Given value "
-        + repr(value)
+        + value_repr
         + " of type "
-        + type(value).__name__
+        + value_type.__name__
         + " did not match any provided pattern"
     )
@@ -0,0 +1,26 @@
+from typing import Callable, List, Optional
+
+import terminology.ansi as ansi
+
+ESCAPE = "\033"
+
+
+def prestyled(style: Callable[[str], str]) -> Callable[[str], str]:
+    """
+    Make a text style cheaper to apply
+
+    The escape sequences ``style`` puts around a text are computed on first use. They are then simply concatenated to the texts without escape sequences, which is what ``style`` would output for them. Any other text, or any text styled while ``terminology.disable`` is in effect, is still handed to ``style``.
+    """
+    affixes: Optional[List[str]] = None
+
+    def impl(text: str) -> str:
+        nonlocal affixes
+
+        if ansi.NO_COLOR or ESCAPE in text:
+            return style(text)
+
+        if affixes is None:
+            affixes = style("\x00").split("\x00")
+        return affixes[0] + text + affixes[1]
+
+    return impl
@@ -1,48 +1,87 @@
 import asyncio as aio
 import io
-import os
-from itertools import chain
-from threading import Lock
-from typing import Callable, Iterable, List, NoReturn, Optional, TextIO
+from functools import lru_cache
+from threading import Lock, get_ident, local
+from typing import Callable, Iterable, List, NoReturn, Optional, TextIO, Tuple
 
 from . import readline_extension as rle  # type: ignore
+from .terminal import terminal_columns
 
 UP_GOER = "\033[F"
+BANNER_FORCED_REDRAW_PERIOD = 10
+
+
+def _unsupported(*_) -> NoReturn:
+    """
+    Stand for the reading methods of ``TextIO``, which are not supported by an output stream
+    """
+    raise NotImplementedError()
 
 
 class SynchronizedOStream(TextIO):
+    __slots__ = (
+        "__ostream",
+        "__write",
+        "__lock",
+        "__acquire",
+        "__release",
+        "__use_rawinput",
+        "__write_in_context",
+        "__owner",
+        "__local",
+        "__banners",
+        "__writes_nb",
+        "log",
+        "log_many",
+    )
+
+    __iter__ = __next__ = read = readline = readlines = _unsupported
+
     def __init__(
         self, ostream: TextIO, use_rawinput: bool, modifier: Callable[[str], str]
     ):
+        """
+        Wrap ``ostream``
+
+        ``log(msg, modifier=None, regenerate_prompt=True)`` prints a message followed by a new line, and ``log_many(msgs, modifier=None, regenerate_prompt=True)`` does the same for several messages at once. They are bound here to the implementation matching ``use_rawinput``, so they do not check it on each call. For the same reason, the writer styling with ``modifier`` the messages written within the context is chosen here.
+        """
         self.__ostream = ostream
+        self.__write = ostream.write
         self.__lock = Lock()
+        self.__acquire = self.__lock.acquire
+        self.__release = self.__lock.release
         self.__use_rawinput = use_rawinput
-        self.__modifier = modifier
-        self.__in_context = False
+        self.__owner: Optional[int] = None
+        self.__local = local()
         self.__banners: List[str] = []
+        self.__writes_nb = 0
+        if use_rawinput:
+            write = self.__write
+            self.__write_in_context = lambda msg: write(modifier(msg))
+            self.log = self.__log_to_terminal
+            self.log_many = self.__log_many_to_terminal
+        else:
+            self.__write_in_context = self.__write
+            self.log = self.__log_to_pipe
+            self.log_many = self.__log_many_to_pipe
 
     def __enter__(self) -> "SynchronizedOStream":
         """
         Acquire the stream
 
-        Call to methods other than ``__exit__`` will not have any effect on the lock after entering the context (for example, ``write`` will not try to release the stream).
+        Call to methods other than ``__exit__`` from the thread which entered the context will not have any effect on the lock (for example, ``write`` will not try to release the stream). The identifier of that thread is recorded, so the other threads still wait for the stream to be released. The messages held back for that thread by ``write`` are written first, so they are not written after the messages written within the context.
         """
-        self.__lock.acquire()
-        self.__in_context = True
+        self.__acquire()
+        self.__owner = get_ident()
+        self.__write_held()
         return self
 
     def __exit__(self, *_) -> None:
         """
         Release the stream
         """
-        self.__in_context = False
-        self.__lock.release()
-
-    def __iter__(*_) -> NoReturn:
-        raise NotImplementedError()
-
-    def __next__(*_) -> NoReturn:
-        raise NotImplementedError()
+        self.__owner = None
+        self.__release()
 
     def close(self) -> None:
         return self.__ostream.close()
@@ -50,21 +89,12 @@ class SynchronizedOStream(TextIO):
     def isatty(self) -> bool:
         return self.__ostream.isatty()
 
-    def read(self, *_) -> NoReturn:
-        raise NotImplementedError()
-
     def fileno(self) -> int:
         return self.__ostream.fileno()
 
     def readable(self) -> bool:
         return False
 
-    def readline(self, *_) -> NoReturn:
-        raise NotImplementedError()
-
-    def readlines(self, *_) -> NoReturn:
-        raise NotImplementedError()
-
     def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
         return self.__ostream.seek(offset, whence)
 
@@ -83,102 +113,217 @@ class SynchronizedOStream(TextIO):
     def writelines(self, lines: Iterable[str]) -> None:
         """
         Write several lines consecutively
+
+        The lines are joined and handed over to ``write`` at once, so they are written under a single lock acquisition.
         """
-        self.__ostream.write(str(chain(lines)))
+        self.write("".join(lines))
 
     def write(self, msg: str) -> int:
         """
         Write a string to the wrapped output stream
 
-        If this stream has not been locked yet with the context manager, the lock is released if and only if ``msg`` is newline-terminated or is empty.
+        If the calling thread has not locked this stream yet with the context manager, a message which is not newline-terminated is held back for the calling thread. It is written along with the following messages once a newline-terminated message is received, so a line is written in one go under a single lock acquisition and the lines of the other threads never land in the middle of it. The messages held back are also written by ``flush`` and when the calling thread acquires the stream.
         """
 
         if msg == "":
             return 0
 
-        if not self.__in_context:
-            self.__lock.acquire()
-        n = self.__ostream.write(
-            self.__modifier(msg) if self.__in_context and self.__use_rawinput else msg
-        )
-        if msg[-1] == "\n" and not self.__in_context:
-            self.__lock.release()
+        self.__writes_nb += 1
+        if self.__owner == get_ident():
+            return self.__write_in_context(msg)
+
+        n = len(msg)
+        fragments = self.__fragments()
+        if msg[-1] != "\n":
+            fragments.append(msg)
+            return n
+
+        if fragments:
+            fragments.append(msg)
+            msg = "".join(fragments)
+            fragments.clear()
+
+        self.__acquire()
+        try:
+            self.__write(msg)
+        finally:
+            self.__release()
 
         return n
 
     def flush(self) -> None:
         """
-        Call the underlying stream ``flush`` method
+        Write the messages held back for the calling thread and call the underlying stream ``flush`` method
+
+        A partial line, such as a prompt, is thus shown once the caller flushes the stream.
         """
+        if self.__owner == get_ident():
+            self.__write_held()
+        else:
+            fragments = self.__fragments()
+            if fragments:
+                msg = "".join(fragments)
+                fragments.clear()
+                self.__acquire()
+                try:
+                    self.__write(msg)
+                finally:
+                    self.__release()
+
         return self.__ostream.flush()
 
-    def log(
+    def __log_to_terminal(
         self,
         msg: str,
         modifier: Optional[Callable[[str], str]] = None,
         regenerate_prompt: bool = True,
     ) -> None:
         """
-        Print the given message to the output stream
+        Print the given message to the terminal
 
-        A new line is inserted after the message.
+        A new line is inserted after the message. The message and the banners redrawn below it are gathered into a single write, which is built before acquiring the stream so the lock is only held to write it.
         """
 
+        if modifier:
+            msg = modifier(msg)
+        frame = self.__render([_linewiper(msg)])
+
         with self:
-            if modifier and self.__use_rawinput:
-                msg = modifier(msg)
+            self.__write(frame)
+            if regenerate_prompt:
+                rle.forced_update_display()
 
-            if self.__use_rawinput:
-                msg = _linewiper(msg)
-                for i, banner in enumerate(self.__banners):
-                    msg += _below(str(banner), position=i) + _linewiper()
-            else:
-                msg += "\n"
+    def __log_many_to_terminal(
+        self,
+        msgs: Iterable[str],
+        modifier: Optional[Callable[[str], str]] = None,
+        regenerate_prompt: bool = True,
+    ) -> None:
+        """
+        Print the given messages to the terminal
 
-            self.__ostream.write(msg)
+        A new line is inserted after each message. The messages and the banners redrawn below them are gathered into a single write, which is built before acquiring the stream, and the prompt is regenerated only once.
+        """
+
+        frame = self.__render(
+            [_linewiper(modifier(msg) if modifier else msg) for msg in msgs]
+        )
 
-            if self.__use_rawinput and regenerate_prompt:
+        with self:
+            self.__write(frame)
+            if regenerate_prompt:
                 rle.forced_update_display()
 
+    def __render(self, parts: List[str]) -> str:
+        """
+        Append the banners to ``parts``, each one drawn on its line below the cursor, and join them
+
+        The banners are taken from a snapshot of the list, since they may be added or removed by ``update_banner`` meanwhile.
+        """
+        for i, banner in enumerate(tuple(self.__banners)):
+            parts += (_below(str(banner), position=i), _linewiper())
+        return "".join(parts)
+
+    def __log_to_pipe(
+        self,
+        msg: str,
+        modifier: Optional[Callable[[str], str]] = None,
+        regenerate_prompt: bool = True,
+    ) -> None:
+        """
+        Print the given message to an output stream which is not a terminal
+
+        A new line is inserted after the message. It is not styled since there is no terminal to interpret the escape sequences.
+        """
+
+        with self:
+            self.__write(msg + "\n")
+
+    def __log_many_to_pipe(
+        self,
+        msgs: Iterable[str],
+        modifier: Optional[Callable[[str], str]] = None,
+        regenerate_prompt: bool = True,
+    ) -> None:
+        """
+        Print the given messages to an output stream which is not a terminal
+
+        A new line is inserted after each message. The messages are written at once and are not styled.
+        """
+
+        with self:
+            self.__write("".join(msg + "\n" for msg in msgs))
+
     async def update_banner(
         self, banner: str, refresh_delay_s: int, stop_event: aio.Event
     ) -> None:
         """
         Add a banner to display, update its output regulary and remove it
 
-        The banner update can be stopped by setting ``stop_event``.
+        The banner update can be stopped by setting ``stop_event``. The banner is redrawn when its output, its position or the terminal width has changed, or when something has been written over it since the last redraw. Since the terminal output which does not go through ``write`` (the user input echoed by GNU Readline, for example) cannot be noticed, the banner is still redrawn every ``BANNER_FORCED_REDRAW_PERIOD`` refreshes.
         """
         self.__banners.append(banner)
 
         if not self.__use_rawinput:
             return
 
+        drawn = None
+        refreshes_nb = 0
         while not stop_event.is_set():
-            with self:
-                self.__ostream.write(
-                    _below(str(banner), position=self.__banners.index(banner))
-                    + _linewiper()
-                )
-                rle.forced_update_display()
+            frame = (
+                str(banner),
+                self.__banners.index(banner),
+                self.__writes_nb,
+                terminal_columns(),
+            )
+            refreshes_nb += 1
+            if frame != drawn or refreshes_nb >= BANNER_FORCED_REDRAW_PERIOD:
+                drawn = frame
+                refreshes_nb = 0
+                with self:
+                    self.__write(_below(frame[0], position=frame[1]) + _linewiper())
+                    rle.forced_update_display()
             await aio.sleep(refresh_delay_s)
 
         with self:
-            self.__ostream.write(_below(position=len(self.__banners) - 1))
+            self.__write(_below(position=len(self.__banners) - 1))
             rle.forced_update_display()
 
         self.__banners.remove(banner)
 
+    def __fragments(self) -> List[str]:
+        """
+        Get the messages held back for the calling thread
+        """
+        try:
+            return self.__local.fragments
+        except AttributeError:
+            self.__local.fragments = []
+            return self.__local.fragments
+
+    def __write_held(self) -> None:
+        """
+        Write the messages held back for the calling thread, which must hold the stream
+        """
+        fragments = self.__fragments()
+        if fragments:
+            self.__write("".join(fragments))
+            fragments.clear()
+
     def acquire(self) -> None:
         """
         Acquire the output stream
+
+        The messages held back for the calling thread are written first, as when entering the context.
         """
-        self.__lock.acquire()
+        self.__acquire()
+        self.__write_held()
 
     def release(self) -> None:
         """
         Release the output stream
         """
-        self.__lock.release()
+        self.__release()
 
 
 def _linewiper(msg: Optional[str] = None) -> str:
@@ -187,12 +332,28 @@ def _linewiper(msg: Optional[str] = None) -> str:
 
     With no argument, the line is just wiped and no newlines are inserted.
     """
-    return (
-        "\r"
-        + " " * os.get_terminal_size().columns
-        + "\r"
-        + (msg + "\n" if msg is not None else "")
-    )
+    eraser = _line_eraser(terminal_columns())
+    return eraser if msg is None else eraser + msg + "\n"
+
+
+@lru_cache(maxsize=1)
+def _line_eraser(columns: int) -> str:
+    """
+    Get a string that erases a line of ``columns`` columns and brings the cursor back to its beginning
+
+    The string is only built again when the terminal width changes.
+    """
+    return "\r" + _blank_line(columns) + "\r"
+
+
+@lru_cache(maxsize=1)
+def _blank_line(columns: int) -> str:
+    """
+    Get a line of ``columns`` spaces
+
+    The same string is shared by ``_line_eraser`` and ``_below_parts``, and is only built again when the terminal width changes.
+    """
+    return " " * columns
 
 
 def _below(msg: str = "", position: int = 0) -> str:
@@ -201,10 +362,18 @@ def _below(msg: str = "", position: int = 0) -> str:
 
     A message can be printed several lines below with the ``position`` parameter.
     """
+    prefix, suffix = _below_parts(position, terminal_columns())
+    return prefix + msg + suffix
+
+
+@lru_cache(maxsize=64)
+def _below_parts(position: int, columns: int) -> Tuple[str, str]:
+    """
+    Get the strings surrounding a message written by ``_below``
+
+    The first one moves the cursor down to the line of the banner at ``position`` and wipes this line, the second one moves the cursor back up. Only a few banners are displayed at a time, so the strings are built once per position and terminal width.
+    """
     return (
-        "\n" * (position + 1)
-        + " " * os.get_terminal_size().columns
-        + "\r"
-        + msg
-        + UP_GOER * (position + 1)
+        "\n" * (position + 1) + _blank_line(columns) + "\r",
+        UP_GOER * (position + 1),
     )
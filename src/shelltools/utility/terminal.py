@@ -0,0 +1,63 @@
+import shutil
+import signal
+import sys
+import threading
+from time import monotonic
+from typing import Optional
+
+TERMINAL_SIZE_REFRESH_DELAY_S = 200e-3
+
+_columns: Optional[int] = None
+_last_refresh_s = 0.0
+_is_watching_resize = False
+
+
+def terminal_columns() -> int:
+    """
+    Get the width of the terminal in columns
+
+    The width is cached so querying it does not cost a system call each time. The cache is invalidated on ``SIGWINCH`` when the handler could be installed, otherwise the width is queried again after ``TERMINAL_SIZE_REFRESH_DELAY_S`` seconds. It is queried with ``shutil.get_terminal_size``, the way ``argparse`` does, so ``COLUMNS`` is honoured and a default width is used when the output is not a terminal.
+    """
+    global _columns, _last_refresh_s
+
+    if _columns is None or (
+        not _is_watching_resize
+        and monotonic() - _last_refresh_s > TERMINAL_SIZE_REFRESH_DELAY_S
+    ):
+        _columns = shutil.get_terminal_size().columns
+        _last_refresh_s = monotonic()
+
+    return _columns
+
+
+def install_sigwinch_handler() -> bool:
+    """
+    Invalidate the cached terminal width whenever the terminal is resized
+
+    It is not called on import, so the handler of the host application is only replaced when asked for, and a handler set from Python is chained to the new one. The handler can only be installed from the main thread and on platforms providing ``SIGWINCH``. It is not installed either once the ``readline`` module has been imported, or if a handler has been set by a non-Python code, since such a handler could not be called back. ``signal.getsignal`` does not report the handler of GNU Readline, hence the check of the imported modules. The width is then refreshed periodically. Return ``True`` if the handler is installed.
+    """
+    global _is_watching_resize
+
+    if _is_watching_resize:
+        return True
+
+    if (
+        not hasattr(signal, "SIGWINCH")
+        or threading.current_thread() is not threading.main_thread()
+        or "readline" in sys.modules
+    ):
+        return False
+
+    previous_handler = signal.getsignal(signal.SIGWINCH)
+    if previous_handler is None:
+        return False
+
+    def handler(signum, frame):
+        global _columns
+        _columns = None
+        if callable(previous_handler):
+            previous_handler(signum, frame)
+
+    signal.signal(signal.SIGWINCH, handler)
+    _is_watching_resize = True
+    return True
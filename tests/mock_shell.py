@@ -43,8 +43,7 @@ class MockShell(Shell):
         """
         Print many alerts
         """
-        for i in range(100):
-            self.log("alert")
+        self.log_many("alert" for i in range(100))
 
     @command()
     async def do_timmed_alert(self):
@@ -57,6 +56,17 @@ class MockShell(Shell):
         await aio.sleep(1)
         self.log("alert3")
 
+    @command()
+    async def do_increment_later(self):
+        """
+        Increment once from a task spawned by the command
+        """
+
+        async def increment():
+            self.x += 1
+
+        self.create_task(increment())
+
     @command()
     def do_panic(self):
         """
@@ -133,11 +143,13 @@ class MockShell(Shell):
                 nonlocal keep_going
                 keep_going = False
 
+            handle_event = Match() & {
+                (True, Key.left): move_left,
+                (True, Key.right): move_right,
+                (False, Key.esc): stop,
+                tuple: lambda _: None,
+            }
+
             while keep_going:
-                Match(await listener.get()) & {
-                    (True, Key.left): move_left,
-                    (True, Key.right): move_right,
-                    (False, Key.esc): stop,
-                    tuple: lambda _: None,
-                }
+                handle_event(await listener.get())
                 await aio.sleep(10e-3)
@@ -0,0 +1,74 @@
+import pytest
+
+from shelltools.shell.command import _Parser
+
+
+class RecordingShell:
+    def __init__(self):
+        self.messages = []
+
+    def log(self, msg, *_, **__):
+        self.messages.append(msg)
+
+    log_error = log_help = log
+
+
+def positionals_and_options(parser):
+    parser.add_argument("n", type=int)
+    parser.add_argument("name")
+    parser.add_argument("--ratio", type=float, default="1.5")
+    parser.add_argument("--verbose", action="store_true")
+
+
+def required_group(parser):
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--left", action="store_true")
+    group.add_argument("--right", action="store_true")
+
+
+def argument_group(parser):
+    parser.add_argument("n", type=int)
+    parser.add_argument_group("extra").add_argument("name")
+
+
+def parse(parser, line, fast_path):
+    shell = RecordingShell()
+    try:
+        if fast_path:
+            result = parser.parse(shell, line)
+        else:
+            # The shell is only handed over by ``parse``, ``parse_args`` needs it to report the failures
+            parser._Parser__shell = shell
+            result = parser.parse_args(line.split())
+    except SystemExit:
+        result = SystemExit
+    return result, shell.messages
+
+
+@pytest.mark.parametrize(
+    "build, line",
+    [
+        (positionals_and_options, "1 x"),
+        (positionals_and_options, "1"),
+        (positionals_and_options, ""),
+        (positionals_and_options, "1 x y"),
+        (positionals_and_options, "-- 1 x"),
+        (positionals_and_options, "1 --"),
+        (positionals_and_options, "-1 x"),
+        (positionals_and_options, "one x"),
+        (positionals_and_options, '"1" x'),
+        (positionals_and_options, "1 'x y'"),
+        (positionals_and_options, "1 x --ratio 2"),
+        (required_group, ""),
+        (required_group, "--left"),
+        (required_group, "--left --right"),
+        (argument_group, "1"),
+        (argument_group, "1 x"),
+    ],
+)
+def test_parse_like_argparse(build, line):
+    fast_parser, parser = _Parser(prog="cmd"), _Parser(prog="cmd")
+    build(fast_parser)
+    build(parser)
+
+    assert parse(fast_parser, line, True) == parse(parser, line, False)
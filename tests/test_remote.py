@@ -1,5 +1,6 @@
+import asyncio as aio
 import random as rnd
-from multiprocessing import Value
+from struct import Struct
 from warnings import simplefilter
 
 import pytest
@@ -11,13 +12,63 @@ from . import test_extension_module as tem  # type: ignore
 
 pytest_plugins = ("pytest_asyncio",)
 
+PACKERS = {
+    (1, False): Struct("<B").pack,
+    (2, False): Struct("<H").pack,
+    (4, False): Struct("<I").pack,
+    (1, True): Struct("<b").pack,
+    (2, True): Struct("<h").pack,
+    (4, True): Struct("<i").pack,
+    (8, True): Struct("<q").pack,
+}
+
+
+REPLY_VALUE = Struct("<q")
+REPLY_TEMPLATES = {
+    False: HEADER + b"\x00" + 32 * b"\x00",
+    True: HEADER + b"\x00" + 32 * b"\xff",
+}
+
+
+def reply(value: int) -> bytes:
+    """
+    Make the packet replying ``value`` as a 32-byte integer
+
+    ``value`` must fit in 64 bits. It is packed into a copy of the template whose padding is already the sign extension of ``value``.
+    """
+    packet = bytearray(REPLY_TEMPLATES[value < 0])
+    REPLY_VALUE.pack_into(packet, len(HEADER) + 1, value)
+    return bytes(packet)
+
+
+def stub_requests(mock_serial, requests) -> None:
+    """
+    Stub the replies to several requests at once
+
+    ``requests`` is made of ``(opcode, packer, argument, result)`` tuples. The request made of ``opcode`` and ``argument`` packed with ``PACKERS[packer]`` is replied ``result``.
+    """
+    for opcode, packer, argument, result in requests:
+        mock_serial.stub(
+            receive_bytes=HEADER + bytes((opcode,)) + PACKERS[packer](argument),
+            send_bytes=reply(result),
+        )
+
+
+@pytest.fixture
+def dispatcher():
+    return tem.Dispatcher()
+
+
+@pytest.fixture
+def remote(mock_serial, dispatcher):
+    remote = Remote(port=mock_serial.port, dispatcher=dispatcher, reply_key=tem.reply)
+    yield remote
+    # The remote may have been closed by the test already, closing it again has no effect
+    remote.close()
 
-@pytest.mark.asyncio
-async def test_request_an_action_through_remote(mock_serial):
-    remote = Remote(
-        port=mock_serial.port, dispatcher=tem.Dispatcher(), reply_key=tem.reply
-    )
 
+@pytest.mark.asyncio
+async def test_request_an_action_through_remote(mock_serial, remote):
     u8 = rnd.getrandbits(6)
     u16 = rnd.getrandbits(14)
     u32 = rnd.getrandbits(30)
@@ -27,52 +78,32 @@ async def test_request_an_action_through_remote(mock_serial):
     i64 = -rnd.getrandbits(62)
     max_int, min_int = 2**63 - 1, -(2**63)
 
-    mock_serial.stub(
-        receive_bytes=HEADER + b"\x00" + u8.to_bytes(1, "little"),
-        send_bytes=HEADER + b"\x00" + (2 * u8).to_bytes(32, "little"),
-    )
-    mock_serial.stub(
-        receive_bytes=HEADER + b"\x01" + u16.to_bytes(2, "little"),
-        send_bytes=HEADER + b"\x00" + (2 * u16).to_bytes(32, "little"),
-    )
-    mock_serial.stub(
-        receive_bytes=HEADER + b"\x02" + u32.to_bytes(4, "little"),
-        send_bytes=HEADER + b"\x00" + (2 * u32).to_bytes(32, "little"),
-    )
-    mock_serial.stub(
-        receive_bytes=HEADER + b"\x03" + i8.to_bytes(1, "little", signed=True),
-        send_bytes=HEADER + b"\x00" + (2 * i8).to_bytes(32, "little", signed=True),
-    )
-    mock_serial.stub(
-        receive_bytes=HEADER + b"\x04" + i16.to_bytes(2, "little", signed=True),
-        send_bytes=HEADER + b"\x00" + (2 * i16).to_bytes(32, "little", signed=True),
-    )
-    mock_serial.stub(
-        receive_bytes=HEADER + b"\x05" + i32.to_bytes(4, "little", signed=True),
-        send_bytes=HEADER + b"\x00" + (2 * i32).to_bytes(32, "little", signed=True),
-    )
-    mock_serial.stub(
-        receive_bytes=HEADER + b"\x06" + i64.to_bytes(8, "little", signed=True),
-        send_bytes=HEADER + b"\x00" + (2 * i64).to_bytes(32, "little", signed=True),
-    )
-    mock_serial.stub(
-        receive_bytes=HEADER + b"\x07" + max_int.to_bytes(8, "little", signed=True),
-        send_bytes=HEADER + b"\x00" + max_int.to_bytes(32, "little", signed=True),
-    )
-    mock_serial.stub(
-        receive_bytes=HEADER + b"\x07" + min_int.to_bytes(8, "little", signed=True),
-        send_bytes=HEADER + b"\x00" + min_int.to_bytes(32, "little", signed=True),
+    stub_requests(
+        mock_serial,
+        [
+            (0x00, (1, False), u8, 2 * u8),
+            (0x01, (2, False), u16, 2 * u16),
+            (0x02, (4, False), u32, 2 * u32),
+            (0x03, (1, True), i8, 2 * i8),
+            (0x04, (2, True), i16, 2 * i16),
+            (0x05, (4, True), i32, 2 * i32),
+            (0x06, (8, True), i64, 2 * i64),
+            (0x07, (8, True), max_int, max_int),
+            (0x07, (8, True), min_int, min_int),
+        ],
     )
 
-    assert await remote.call(tem.double_u8, u8) == 2 * u8
-    assert await remote.call(tem.double_u16, u16) == 2 * u16
-    assert await remote.call(tem.double_u32, u32) == 2 * u32
-    assert await remote.call(tem.double_i8, i8) == 2 * i8
-    assert await remote.call(tem.double_i16, i16) == 2 * i16
-    assert await remote.call(tem.double_i32, i32) == 2 * i32
-    assert await remote.call(tem.double_i64, i64) == 2 * i64
-    assert await remote.call(tem.identity_i64, max_int) == max_int
-    assert await remote.call(tem.identity_i64, min_int) == min_int
+    assert await aio.gather(
+        remote.call(tem.double_u8, u8),
+        remote.call(tem.double_u16, u16),
+        remote.call(tem.double_u32, u32),
+        remote.call(tem.double_i8, i8),
+        remote.call(tem.double_i16, i16),
+        remote.call(tem.double_i32, i32),
+        remote.call(tem.double_i64, i64),
+        remote.call(tem.identity_i64, max_int),
+        remote.call(tem.identity_i64, min_int),
+    ) == [2 * u8, 2 * u16, 2 * u32, 2 * i8, 2 * i16, 2 * i32, 2 * i64, max_int, min_int]
 
     awaitables = [
         remote.call(tem.double_u8, u8),
@@ -85,38 +116,29 @@ async def test_request_an_action_through_remote(mock_serial):
 
 
 @pytest.mark.asyncio
-async def test_handle_request_to_and_from_device_simulatneously(mock_serial):
+async def test_handle_request_to_and_from_device_simulatneously(
+    mock_serial, dispatcher, remote
+):
     arg_to, arg_from = rnd.getrandbits(31), rnd.getrandbits(31)
-    witness = Value("i", ~arg_from)
+    witness = ~arg_from
 
     def set_witness(x):
         nonlocal witness
-        witness.value = x
+        witness = x
 
     mock_serial.stub(
-        receive_bytes=HEADER + b"\x02" + arg_to.to_bytes(4, "little"),
-        send_bytes=HEADER
-        + b"\x01"
-        + arg_from.to_bytes(4, "little")
-        + HEADER
-        + b"\x00"
-        + (2 * arg_to).to_bytes(32, "little"),
+        receive_bytes=HEADER + b"\x02" + PACKERS[(4, False)](arg_to),
+        send_bytes=HEADER + b"\x01" + PACKERS[(4, False)](arg_from) + reply(2 * arg_to),
     )
 
-    dispatcher = tem.Dispatcher()
     dispatcher.replace(tem.do_something, set_witness)
-    remote = Remote(port=mock_serial.port, dispatcher=dispatcher, reply_key=tem.reply)
 
     assert await remote.call(tem.double_u32, arg_to) == 2 * arg_to
-    assert witness.value == arg_from
+    assert witness == arg_from
 
 
 @pytest.mark.asyncio
-async def test_progagate_exception_back_to_main_thread(mock_serial):
-    remote = Remote(
-        port=mock_serial.port, dispatcher=tem.Dispatcher(), reply_key=tem.reply
-    )
-
+async def test_progagate_exception_back_to_main_thread(mock_serial, remote):
     mock_serial.stub(
         receive_bytes=HEADER + b"\x00\x00",
         send_bytes=HEADER + b"\xff",
@@ -135,13 +157,33 @@ async def test_progagate_exception_back_to_main_thread(mock_serial):
 
 
 @pytest.mark.asyncio
-async def test_warn_when_action_returns_non_void(mock_serial):
-    simplefilter("error")
-
-    remote = Remote(
-        port=mock_serial.port, dispatcher=tem.Dispatcher(), reply_key=tem.reply
+async def test_fail_requests_once_closed(mock_serial, remote):
+    mock_serial.stub(
+        receive_bytes=HEADER + b"\x00" + PACKERS[(1, False)](1),
+        send_bytes=reply(2),
     )
 
+    assert await remote.call(tem.double_u8, 1) == 2
+
+    request = remote.call(tem.double_u16, 0x00)
+    remote.close()
+
+    with pytest.raises(RuntimeError):
+        await request
+
+    with pytest.raises(RuntimeError):
+        await remote.call(tem.double_u8, 1)
+
+    remote.close()
+
+    with pytest.raises(RuntimeError):
+        await remote.call(tem.double_u8, 1)
+
+
+@pytest.mark.asyncio
+async def test_warn_when_action_returns_non_void(mock_serial, remote):
+    simplefilter("error")
+
     mock_serial.stub(
         receive_bytes=HEADER + b"\x00\x00",
         send_bytes=HEADER + b"\x03\x00\x00\x00\x00" + HEADER + b"\x00" + 32 * b"\x00",
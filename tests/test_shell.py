@@ -1,11 +1,33 @@
 import random as rnd
-from io import StringIO
+from io import StringIO, TextIOBase
 
 import pytest
 
 from .mock_shell import MockShell
 
 
+class ListWriter(TextIOBase):
+    """
+    Output stream which keeps the written strings in a list
+
+    They are only joined when the written text is requested with ``getvalue``.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.__chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        self.__chunks.append(s)
+        return len(s)
+
+    def getvalue(self):
+        return "".join(self.__chunks)
+
+
 @pytest.fixture
 def mock_stdin():
     return StringIO()
@@ -13,7 +35,7 @@ def mock_stdin():
 
 @pytest.fixture
 def mock_stdout():
-    return StringIO()
+    return ListWriter()
 
 
 @pytest.fixture
@@ -43,6 +65,17 @@ async def test_run_command_with_argument(mock_shell, mock_stdin, mock_stdout):
     assert mock_shell.x == n + 5
 
 
+@pytest.mark.asyncio
+async def test_create_task_from_command(mock_shell, mock_stdin, mock_stdout):
+    mock_stdin.write("increment_later\nEOF\n")
+    mock_stdin.seek(0)
+    n = rnd.randint(0, 100)
+    mock_shell.x = n
+    await mock_shell.run()
+
+    assert mock_shell.x == n + 1
+
+
 @pytest.mark.asyncio
 async def test_print_to_stdout(mock_shell, mock_stdin, mock_stdout):
     mock_stdin.write("big_alert\nEOF\n")
@@ -0,0 +1,56 @@
+from io import StringIO
+from threading import Thread
+from time import sleep
+
+from shelltools.utility.synchronized_ostream import SynchronizedOStream
+
+
+def make_stream():
+    ostream = StringIO()
+    return ostream, SynchronizedOStream(
+        ostream, use_rawinput=False, modifier=lambda x: x
+    )
+
+
+def test_write_lines():
+    ostream, stream = make_stream()
+
+    stream.writelines(["first\n", "second", " line\n"])
+
+    assert ostream.getvalue() == "first\nsecond line\n"
+
+
+def test_wait_for_the_thread_holding_the_stream():
+    ostream, stream = make_stream()
+    writer = Thread(target=stream.write, args=("other thread\n",))
+
+    with stream:
+        writer.start()
+        sleep(50e-3)
+        stream.write("holding thread\n")
+
+    writer.join()
+
+    assert ostream.getvalue() == "holding thread\nother thread\n"
+
+
+def test_keep_other_threads_out_of_a_line():
+    ostream, stream = make_stream()
+    writer = Thread(target=stream.write, args=("other thread\n",))
+
+    stream.write("Progress:")
+    stream.write(" ")
+    writer.start()
+    writer.join()
+    stream.write("done\n")
+
+    assert ostream.getvalue() == "other thread\nProgress: done\n"
+
+
+def test_write_partial_line_on_flush():
+    ostream, stream = make_stream()
+
+    stream.write("Progress: ")
+    stream.flush()
+
+    assert ostream.getvalue() == "Progress: "
@@ -0,0 +1,14 @@
+import signal
+
+import pytest
+
+from shelltools.utility import terminal
+
+
+def test_leave_sigwinch_to_readline(monkeypatch):
+    pytest.importorskip("readline")
+    monkeypatch.setattr(terminal, "_is_watching_resize", False)
+    previous_handler = signal.getsignal(signal.SIGWINCH)
+
+    assert not terminal.install_sigwinch_handler()
+    assert signal.getsignal(signal.SIGWINCH) is previous_handler
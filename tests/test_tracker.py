@@ -1,4 +1,5 @@
 import pytest
+from pandas import DataFrame
 from unpadded import Client  # type: ignore
 
 from shelltools.tracker import *
@@ -18,8 +19,7 @@ class MockClient(Client):
         if payload == self.__trigger:
             assert not self.is_running
             self.is_running = True
-            for b in self.__response:
-                self.__dispatcher.put(b)
+            self.feed(self.__response)
         if payload == self.__stop:
             assert self.is_running
             self.is_running = False
@@ -27,6 +27,10 @@ class MockClient(Client):
     def replace(self, key, f):
         self.__dispatcher.replace(key, f)
 
+    def feed(self, payload):
+        for b in payload:
+            self.__dispatcher.put(b)
+
 
 @pytest.fixture
 def triple_reporter_client():
@@ -52,3 +56,19 @@ async def test_track_until_timeout(triple_reporter_client):
         assert DataFrame(
             {"timestamp": [0, 1, 2], "left": [2, 1, 2], "right": [0, 1, 2]}
         ).equals(await ctx.timeout(10e-3))
+
+
+@pytest.mark.asyncio
+async def test_drop_reports_received_before_tracking(triple_reporter_client):
+    tracker = Tracker(
+        client=triple_reporter_client,
+        control_key=tem.control_tracker,
+        report_key=tem.report,
+    )
+
+    triple_reporter_client.feed(tem.report.encode(3, 3, 3))
+
+    async with tracker as ctx:
+        assert DataFrame(
+            {"timestamp": [0, 1, 2], "left": [2, 1, 2], "right": [0, 1, 2]}
+        ).equals(await ctx.timeout(10e-3))